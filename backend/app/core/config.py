@@ -41,6 +41,11 @@ class Settings(BaseSettings):
     # Assemblies directory for execute-assembly (path traversal protection)
     assemblies_dir: str = "/app/data/assemblies"
 
+    # Save Playwright storage state when an automation session stops, keyed by
+    # its injected cookie set, and resume from it next time (files are 0600 and
+    # contain live cookies; unset = disabled)
+    automation_state_dir: Optional[str] = None
+
     # GitHub token for armory operations (increases rate limit from 60 to 5000/hour)
     github_token: Optional[str] = None
 
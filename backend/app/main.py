@@ -22,7 +22,9 @@ from app.core.exceptions import (
 )
 from app.api.v1 import api_router
 from app.api.websocket import websocket_router
+from app.services.browser_ops import get_cdp_pool
 from app.services.database import init_db, close_db
+from app.services.playwright_service import get_playwright_service
 from app.services.sliver_client import sliver_manager
 from app.middleware.rate_limit import RateLimitMiddleware
 
@@ -75,6 +77,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     # Disconnect from Sliver
     await sliver_manager.disconnect()
 
+    # Close pooled CDP connections
+    await get_cdp_pool().aclose()
+
+    # Close automation sessions and their shared browsers
+    await get_playwright_service().shutdown()
+
     # Close database
     await close_db()
 
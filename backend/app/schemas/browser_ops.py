@@ -2,7 +2,7 @@
 Browser operations schemas for cookie extraction, proxy, and CDP debugging
 """
 
-from typing import List, Literal, Optional
+from typing import Any, List, Literal, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -324,9 +324,9 @@ class ExecuteJSRequest(BaseModel):
 
 
 class ExecuteJSResponse(BaseModel):
-    """JavaScript execution result"""
+    """JavaScript execution result (any JSON value returned by the script)"""
 
-    result: Optional[str] = None
+    result: Any = None
     error: Optional[str] = None
 
 
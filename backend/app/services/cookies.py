@@ -0,0 +1,50 @@
+"""
+Cookie conversion shared by CDP injection and Playwright sessions.
+"""
+
+import ciso8601
+
+# CDP / Playwright sameSite values keyed by lowercased stored value
+_SAME_SITE = {"strict": "Strict", "lax": "Lax", "none": "None"}
+
+
+def to_browser_cookie(cookie: dict) -> dict:
+    """
+    Convert a stored cookie dict to a browser cookie param, accepted both by
+    CDP Network.setCookie(s) and Playwright's add_cookies().
+    """
+    get = cookie.get
+    domain = get("domain", "")
+    path = get("path", "/")
+    secure = get("secure", False)
+
+    browser_cookie = {
+        "name": get("name", ""),
+        "value": get("value", ""),
+        "domain": domain,
+        "path": path,
+        "secure": secure,
+        "httpOnly": get("http_only", False),
+        # URL for the cookie (required by CDP)
+        "url": ("https://" if secure else "http://") + domain.removeprefix(".") + path,
+    }
+
+    same_site = get("same_site")
+    if same_site:
+        ss = _SAME_SITE.get(same_site.lower())
+        if ss:
+            browser_cookie["sameSite"] = ss
+
+    expires = get("expires")
+    if expires:
+        try:
+            browser_cookie["expires"] = int(expires)
+        except ValueError:
+            # Not an epoch - ISO 8601 (ciso8601 handles a trailing "Z")
+            try:
+                dt = ciso8601.parse_datetime(str(expires))
+                browser_cookie["expires"] = int(dt.timestamp())
+            except (ValueError, TypeError):
+                pass
+
+    return browser_cookie
@@ -5,34 +5,76 @@ Manages headless browser sessions for session replay/hijacking.
 Runs headless Chromium inside the Docker container with injected cookies.
 """
 
+import asyncio
 import base64
-import json
+import hashlib
 import logging
-import uuid
+import os
+import secrets
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from app.core.config import settings
+from app.services.cookies import to_browser_cookie
 
 logger = logging.getLogger(__name__)
 
+_LAUNCH_ARGS = ("--no-sandbox", "--disable-gpu", "--disable-dev-shm-usage")
+
+_BrowserKey = Tuple[Tuple[str, ...], Optional[str]]
+
+# Browsers with no sessions kept running for reuse; beyond this the least
+# recently used idle one is closed (e.g. when cycling per-target proxies)
+_MAX_IDLE_BROWSERS = 2
+
+
+def _write_private(path: Path, data: bytes) -> None:
+    """Write a file readable only by the owner (it holds live cookies)"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.chmod(path, 0o600)
+
+
+async def _b64encode(data: bytes) -> str:
+    """Base64-encode screenshot bytes in a worker thread, off the event loop"""
+    encoded = await asyncio.to_thread(base64.b64encode, data)
+    return encoded.decode("ascii")
+
 
 @dataclass
 class AutomationSession:
     """Tracks a running Playwright browser automation session"""
 
     session_id: str
-    browser: Any = None  # playwright Browser
+    browser: Any = None  # playwright Browser (shared, owned by the service)
+    browser_key: Optional[_BrowserKey] = None
     context: Any = None  # playwright BrowserContext
     page: Any = None  # playwright Page
     cookies_injected: int = 0
     created_at: str = ""
+    storage_state_path: Optional[Path] = None  # saved on stop, if enabled
 
 
 class PlaywrightService:
     """Manages headless browser automation sessions for session replay"""
 
-    def __init__(self):
+    def __init__(self, storage_state_dir: Optional[str] = None):
         self._sessions: Dict[str, AutomationSession] = {}
         self._playwright: Any = None
+        # Launched browsers keyed by (launch args, proxy); sessions get
+        # their own BrowserContext on a shared browser. Unreferenced ones
+        # wait in _idle_browsers (oldest first) until reused or evicted.
+        self._browsers: Dict[_BrowserKey, Any] = {}
+        self._browser_refs: Dict[_BrowserKey, int] = {}
+        self._idle_browsers: Dict[_BrowserKey, None] = {}
+        self._browser_lock = asyncio.Lock()
+        # Saved storage state per cookie set (opt-in; holds live cookies)
+        self._storage_state_dir = Path(storage_state_dir) if storage_state_dir else None
 
     async def _ensure_playwright(self):
         """Lazy-init Playwright instance"""
@@ -43,6 +85,66 @@ class PlaywrightService:
             self._playwright = pw
         return self._playwright
 
+    def _storage_state_path(self, pw_cookies: List[dict]) -> Optional[Path]:
+        """Storage state file for a cookie set, or None if caching is disabled"""
+        if not self._storage_state_dir or not pw_cookies:
+            return None
+
+        ordered = sorted(pw_cookies, key=lambda c: (c["domain"], c["path"], c["name"]))
+        key = hashlib.blake2b(
+            orjson.dumps(ordered, option=orjson.OPT_SORT_KEYS), digest_size=16
+        ).hexdigest()
+
+        self._storage_state_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        return self._storage_state_dir / f"{key}.json"
+
+    async def _acquire_browser(self, proxy: Optional[str]) -> Tuple[Any, _BrowserKey]:
+        """
+        Reuse a running Chromium for this proxy, launching one if needed.
+        Each call takes a reference that _release_browser() must drop.
+        """
+        key = (_LAUNCH_ARGS, proxy)
+        async with self._browser_lock:
+            self._idle_browsers.pop(key, None)
+            browser = self._browsers.get(key)
+            if browser is None or not browser.is_connected():
+                pw = await self._ensure_playwright()
+
+                launch_kwargs: dict = {"headless": True, "args": list(_LAUNCH_ARGS)}
+                if proxy:
+                    launch_kwargs["proxy"] = {"server": proxy}
+
+                browser = await pw.chromium.launch(**launch_kwargs)
+                self._browsers[key] = browser
+
+            self._browser_refs[key] = self._browser_refs.get(key, 0) + 1
+            return browser, key
+
+    async def _release_browser(self, key: _BrowserKey) -> None:
+        """
+        Drop a browser reference. A browser left without sessions stays up
+        for reuse, closing the least recently used idle one over the cap.
+        """
+        async with self._browser_lock:
+            refs = self._browser_refs.get(key, 0) - 1
+            if refs > 0:
+                self._browser_refs[key] = refs
+                return
+
+            self._browser_refs.pop(key, None)
+            if key in self._browsers:
+                self._idle_browsers[key] = None
+
+            while len(self._idle_browsers) > _MAX_IDLE_BROWSERS:
+                oldest = next(iter(self._idle_browsers))
+                del self._idle_browsers[oldest]
+                browser = self._browsers.pop(oldest, None)
+                if browser is not None:
+                    try:
+                        await browser.close()
+                    except Exception as e:
+                        logger.warning(f"Error closing automation browser: {e}")
+
     async def start_session(
         self,
         cookies: List[dict],
@@ -55,16 +157,30 @@ class PlaywrightService:
         Start a headless Chromium session with injected cookies.
         Returns an automation_id for subsequent operations.
         """
-        pw = await self._ensure_playwright()
-
-        launch_args = ["--no-sandbox", "--disable-gpu", "--disable-dev-shm-usage"]
-        launch_kwargs: dict = {"headless": True, "args": launch_args}
-
-        if proxy:
-            launch_kwargs["proxy"] = {"server": proxy}
-
-        browser = await pw.chromium.launch(**launch_kwargs)
+        browser, browser_key = await self._acquire_browser(proxy)
+        try:
+            return await self._open_session(
+                browser,
+                browser_key,
+                cookies,
+                user_agent,
+                viewport_width,
+                viewport_height,
+            )
+        except Exception:
+            await self._release_browser(browser_key)
+            raise
 
+    async def _open_session(
+        self,
+        browser: Any,
+        browser_key: _BrowserKey,
+        cookies: List[dict],
+        user_agent: Optional[str],
+        viewport_width: int,
+        viewport_height: int,
+    ) -> str:
+        """Create the context and page for a new session on browser"""
         context_kwargs: dict = {
             "viewport": {"width": viewport_width, "height": viewport_height},
             "ignore_https_errors": True,
@@ -72,67 +188,44 @@ class PlaywrightService:
         if user_agent:
             context_kwargs["user_agent"] = user_agent
 
-        context = await browser.new_context(**context_kwargs)
-
-        # Inject cookies
-        pw_cookies = []
-        for c in cookies:
-            domain = c.get("domain", "")
-            clean_domain = domain.lstrip(".")
-            scheme = "https" if c.get("secure", False) else "http"
-
-            pw_cookie = {
-                "name": c.get("name", ""),
-                "value": c.get("value", ""),
-                "domain": domain,
-                "path": c.get("path", "/"),
-                "secure": c.get("secure", False),
-                "httpOnly": c.get("http_only", False),
-                "url": f"{scheme}://{clean_domain}{c.get('path', '/')}",
-            }
-
-            if c.get("same_site"):
-                ss = c["same_site"].capitalize()
-                if ss in ("Strict", "Lax", "None"):
-                    pw_cookie["sameSite"] = ss
-
-            if c.get("expires"):
-                try:
-                    if str(c["expires"]).isdigit():
-                        pw_cookie["expires"] = int(c["expires"])
-                    else:
-                        from datetime import datetime
-
-                        dt = datetime.fromisoformat(
-                            str(c["expires"]).replace("Z", "+00:00")
-                        )
-                        pw_cookie["expires"] = int(dt.timestamp())
-                except (ValueError, AttributeError):
-                    pass
-
-            pw_cookies.append(pw_cookie)
-
-        if pw_cookies:
-            await context.add_cookies(pw_cookies)
+        pw_cookies = [to_browser_cookie(c) for c in cookies]
+        state_path = self._storage_state_path(pw_cookies)
+
+        resumed = bool(state_path and state_path.exists())
+        if resumed:
+            # Same cookie set seen before - resume from the state saved when
+            # that session stopped (post-login cookies and localStorage)
+            context_kwargs["storage_state"] = str(state_path)
+            context = await browser.new_context(**context_kwargs)
+        else:
+            context = await browser.new_context(**context_kwargs)
+
+            # Inject cookies
+            if pw_cookies:
+                await context.add_cookies(pw_cookies)
 
         page = await context.new_page()
 
-        automation_id = str(uuid.uuid4())[:12]
-        from datetime import datetime, timezone
+        automation_id = secrets.token_hex(6)
 
         self._sessions[automation_id] = AutomationSession(
             session_id=automation_id,
             browser=browser,
+            browser_key=browser_key,
             context=context,
             page=page,
-            cookies_injected=len(pw_cookies),
+            cookies_injected=0 if resumed else len(pw_cookies),
             created_at=datetime.now(timezone.utc).isoformat(),
+            storage_state_path=state_path,
         )
 
-        logger.info(
-            f"Automation session {automation_id} started with "
-            f"{len(pw_cookies)} cookies"
-        )
+        if resumed:
+            logger.info(f"Automation session {automation_id} resumed from saved state")
+        else:
+            logger.info(
+                f"Automation session {automation_id} started with "
+                f"{len(pw_cookies)} cookies"
+            )
         return automation_id
 
     def _get_session(self, automation_id: str) -> AutomationSession:
@@ -160,7 +253,7 @@ class PlaywrightService:
 
         if take_screenshot:
             screenshot_bytes = await session.page.screenshot(type="png")
-            result["screenshot"] = base64.b64encode(screenshot_bytes).decode()
+            result["screenshot"] = await _b64encode(screenshot_bytes)
 
         return result
 
@@ -180,7 +273,7 @@ class PlaywrightService:
         viewport = session.page.viewport_size or {"width": 1920, "height": 1080}
 
         return {
-            "screenshot": base64.b64encode(screenshot_bytes).decode(),
+            "screenshot": await _b64encode(screenshot_bytes),
             "width": viewport["width"],
             "height": viewport["height"],
         }
@@ -195,10 +288,8 @@ class PlaywrightService:
 
         try:
             result = await session.page.evaluate(script)
-            return {
-                "result": json.dumps(result) if not isinstance(result, str) else result,
-                "error": None,
-            }
+            # Returned as-is; the HTTP layer serializes it once
+            return {"result": result, "error": None}
         except Exception as e:
             return {"result": None, "error": str(e)}
 
@@ -242,16 +333,33 @@ class PlaywrightService:
         if not session:
             return
 
+        # Saving is best-effort; the context must be closed either way, as
+        # the browser may still be serving other sessions
+        if session.context and session.storage_state_path:
+            try:
+                state = await session.context.storage_state()
+                await asyncio.to_thread(
+                    _write_private, session.storage_state_path, orjson.dumps(state)
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Failed to save storage state for automation session "
+                    f"{automation_id}: {e}"
+                )
+
         try:
-            if session.page:
-                await session.page.close()
-            if session.context:
-                await session.context.close()
-            if session.browser:
-                await session.browser.close()
+            try:
+                if session.page:
+                    await session.page.close()
+            finally:
+                if session.context:
+                    await session.context.close()
         except Exception as e:
             logger.warning(f"Error closing automation session {automation_id}: {e}")
 
+        if session.browser_key is not None:
+            await self._release_browser(session.browser_key)
+
         logger.info(f"Automation session {automation_id} stopped")
 
     async def shutdown(self) -> None:
@@ -259,6 +367,15 @@ class PlaywrightService:
         for session_id in list(self._sessions.keys()):
             await self.stop_session(session_id)
 
+        for browser in self._browsers.values():
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.warning(f"Error closing automation browser: {e}")
+        self._browsers.clear()
+        self._browser_refs.clear()
+        self._idle_browsers.clear()
+
         if self._playwright:
             await self._playwright.stop()
             self._playwright = None
@@ -277,5 +394,7 @@ def get_playwright_service() -> PlaywrightService:
     """Get or create the singleton PlaywrightService instance"""
     global _playwright_service
     if _playwright_service is None:
-        _playwright_service = PlaywrightService()
+        _playwright_service = PlaywrightService(
+            storage_state_dir=settings.automation_state_dir
+        )
     return _playwright_service
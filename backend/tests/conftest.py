@@ -2,7 +2,10 @@
 Shared test fixtures for SliverUI backend tests.
 """
 
+import asyncio
+import functools
 import os
+import sys
 
 # Set required env vars BEFORE importing app modules (Settings reads env at import time)
 os.environ.setdefault("ADMIN_PASSWORD", "testpassword123")
@@ -11,15 +14,24 @@ from unittest.mock import PropertyMock, patch
 
 import pytest
 from httpx import ASGITransport, AsyncClient
+from passlib.context import CryptContext
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
 
-from app.core.config import settings
+from app.core import security
 from app.core.security import create_access_token
-from app.models import Base
+from app.middleware import rate_limit
+from app.models import Base, User
 from app.services.database import get_db, seed_data
 from app.services.sliver_client import SliverManager
 
+# seed_data() inserts the admin as the first user of a fresh database
+ADMIN_USER_ID = 1
+# seed_data() creates roles in the order admin, operator, viewer
+OPERATOR_ROLE_ID = 2
+TEST_PASSWORD = "securepassword1"
+
 # ---------------------------------------------------------------------------
 # Database fixtures
 # ---------------------------------------------------------------------------
@@ -30,31 +42,87 @@ def anyio_backend():
     return "asyncio"
 
 
-@pytest.fixture()
-async def test_engine():
-    """In-memory async SQLite engine, created fresh per test."""
+def pytest_asyncio_loop_factories(config, item):
+    """Run the session event loop on uvloop when it is available."""
+    if sys.platform != "win32":
+        try:
+            import uvloop
+
+            return {"uvloop": uvloop.new_event_loop}
+        except ImportError:
+            pass
+    return {"asyncio": asyncio.new_event_loop}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _fast_password_hashing():
+    """Use the minimum bcrypt cost so hashing and login stay cheap in tests.
+
+    Hashes are also memoized per password: the suite reuses a handful of
+    passwords, and any stored digest still verifies normally.
+    """
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4, deprecated="auto")
+    context.hash = functools.lru_cache(maxsize=None)(context.hash)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(security, "pwd_context", context)
+        yield
+
+
+@pytest.fixture(scope="session")
+async def test_engine(_fast_password_hashing):
+    """In-memory async SQLite engine with schema and seed data, shared by all tests."""
+    # A private in-memory DB per process: pytest-xdist workers are separate
+    # processes, so each gets its own copy. StaticPool keeps the single
+    # connection alive (a NullPool memory DB would vanish between tests).
     engine = create_async_engine(
         "sqlite+aiosqlite://",
         poolclass=StaticPool,
         connect_args={"check_same_thread": False},
     )
+
+    # pysqlite/aiosqlite emit BEGIN lazily and break SAVEPOINT; let SQLAlchemy
+    # control transactions so each test can be rolled back.
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+    # Seed roles, permissions, and the admin user once for the whole run
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await seed_data(session)
+
     yield engine
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
     await engine.dispose()
 
 
 @pytest.fixture()
-async def test_session_maker(test_engine):
-    """Session factory bound to the test engine."""
+async def test_connection(test_engine):
+    """Connection whose outer transaction is rolled back after each test."""
+    async with test_engine.connect() as conn:
+        trans = await conn.begin()
+        yield conn
+        await trans.rollback()
+
+
+@pytest.fixture()
+async def test_session_maker(test_connection):
+    """Session factory bound to the per-test connection.
+
+    Session commits only release a SAVEPOINT, so nothing outlives the test.
+    """
     return async_sessionmaker(
-        test_engine,
+        bind=test_connection,
         class_=AsyncSession,
         expire_on_commit=False,
         autocommit=False,
         autoflush=False,
+        join_transaction_mode="create_savepoint",
     )
 
 
@@ -71,10 +139,30 @@ async def test_db(test_session_maker):
 
 
 @pytest.fixture()
-async def seed_test_data(test_session_maker):
-    """Run seed_data() to create roles, permissions, and the admin user."""
-    async with test_session_maker() as session:
-        await seed_data(session)
+def user_factory(test_db):
+    """Insert a User row directly and return its id, skipping HTTP.
+
+    Hashing goes through the memoized test context, so each distinct
+    password is hashed once per run.
+    """
+
+    async def _create(
+        username: str,
+        password: str = TEST_PASSWORD,
+        role_id: int = OPERATOR_ROLE_ID,
+        **fields,
+    ) -> int:
+        user = User(
+            username=username,
+            password_hash=security.get_password_hash(password),
+            role_id=role_id,
+            **fields,
+        )
+        test_db.add(user)
+        await test_db.commit()
+        return user.id
+
+    return _create
 
 
 # ---------------------------------------------------------------------------
@@ -82,10 +170,27 @@ async def seed_test_data(test_session_maker):
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _relaxed_rate_limits():
+    """Raise rate limits for the whole run so tests aren't throttled."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(rate_limit, "RATE_LIMITS", {})
+        mp.setattr(rate_limit, "DEFAULT_RATE_LIMIT", (10000, 60))
+        yield
+
+
+@pytest.fixture(scope="session")
+def fastapi_app():
+    """The FastAPI application, imported once per run."""
+    from app.main import app  # local import to avoid side-effects at collection time
+
+    return app
+
+
 @pytest.fixture()
-async def test_app(test_session_maker, seed_test_data):
+async def test_app(fastapi_app, test_session_maker):
     """FastAPI application wired to the in-memory test database."""
-    from app.main import app  # local import to avoid side-effects at collection time
+    app = fastapi_app
 
     async def _override_get_db():
         async with test_session_maker() as session:
@@ -101,13 +206,8 @@ async def test_app(test_session_maker, seed_test_data):
     app.dependency_overrides[get_db] = _override_get_db
 
     # Mock sliver_manager.is_connected so health check doesn't need a real server.
-    # Raise rate limits so tests aren't throttled.
-    with (
-        patch.object(
-            SliverManager, "is_connected", new_callable=PropertyMock, return_value=False
-        ),
-        patch("app.middleware.rate_limit.RATE_LIMITS", {}),
-        patch("app.middleware.rate_limit.DEFAULT_RATE_LIMIT", (10000, 60)),
+    with patch.object(
+        SliverManager, "is_connected", new_callable=PropertyMock, return_value=False
     ):
         yield app
 
@@ -119,36 +219,44 @@ async def test_app(test_session_maker, seed_test_data):
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture()
-async def async_client(test_app):
-    """httpx AsyncClient bound to the test app."""
-    transport = ASGITransport(app=test_app)
+@pytest.fixture(scope="session")
+async def shared_client(fastapi_app):
+    """httpx AsyncClient bound to the app, built once per run."""
+    transport = ASGITransport(app=fastapi_app)
     async with AsyncClient(transport=transport, base_url="http://test") as client:
         yield client
 
 
+@pytest.fixture()
+def async_client(test_app, shared_client):
+    """The shared client, with this test's dependency overrides installed."""
+    shared_client.cookies.clear()
+    return shared_client
+
+
 # ---------------------------------------------------------------------------
 # Auth helpers
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture()
-async def admin_token(seed_test_data, test_session_maker):
-    """JWT access token for the seeded admin user."""
-    from sqlalchemy import select
-    from app.models import User
+@pytest.fixture(scope="session")
+def admin_token(test_engine):
+    """JWT access token for the seeded admin user, signed once per run."""
+    return create_access_token(
+        subject=str(ADMIN_USER_ID), additional_claims={"role": "admin"}
+    )
 
-    async with test_session_maker() as session:
-        result = await session.execute(
-            select(User).where(User.username == settings.admin_username)
-        )
-        admin = result.scalar_one()
-        return create_access_token(
-            subject=str(admin.id), additional_claims={"role": "admin"}
-        )
 
+@pytest.fixture(scope="session")
+def admin_auth(admin_token):
+    """Authorization headers and user id of the seeded admin."""
+    return {
+        "headers": {"Authorization": f"Bearer {admin_token}"},
+        "id": ADMIN_USER_ID,
+    }
 
-@pytest.fixture()
-async def admin_headers(admin_token):
+
+@pytest.fixture(scope="session")
+def admin_headers(admin_auth):
     """Authorization header dict for the admin user."""
-    return {"Authorization": f"Bearer {admin_token}"}
+    return admin_auth["headers"]
@@ -2,8 +2,6 @@
 Tests for authentication endpoints (/api/v1/auth/*).
 """
 
-import pytest
-
 from app.core.config import settings
 
 AUTH_PREFIX = "/api/v1/auth"
@@ -14,7 +12,6 @@ AUTH_PREFIX = "/api/v1/auth"
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
 async def test_login_success(async_client):
     """Valid admin creds return access & refresh tokens."""
     resp = await async_client.post(
@@ -32,7 +29,6 @@ async def test_login_success(async_client):
     assert data["expires_in"] > 0
 
 
-@pytest.mark.asyncio
 async def test_login_wrong_password(async_client):
     """Wrong password returns 401."""
     resp = await async_client.post(
@@ -45,7 +41,6 @@ async def test_login_wrong_password(async_client):
     assert resp.status_code == 401
 
 
-@pytest.mark.asyncio
 async def test_login_nonexistent_user(async_client):
     """Non-existent user returns 401."""
     resp = await async_client.post(
@@ -55,7 +50,6 @@ async def test_login_nonexistent_user(async_client):
     assert resp.status_code == 401
 
 
-@pytest.mark.asyncio
 async def test_login_short_password_validation(async_client):
     """Password shorter than 8 chars is rejected with 422."""
     resp = await async_client.post(
@@ -70,7 +64,6 @@ async def test_login_short_password_validation(async_client):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
 async def test_refresh_token_success(async_client):
     """Valid refresh token returns a new token pair."""
     # First, login to get tokens
@@ -93,7 +86,6 @@ async def test_refresh_token_success(async_client):
     assert "refresh_token" in data
 
 
-@pytest.mark.asyncio
 async def test_refresh_token_invalid(async_client):
     """Invalid refresh token returns 401."""
     resp = await async_client.post(
@@ -108,7 +100,6 @@ async def test_refresh_token_invalid(async_client):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
 async def test_me_authenticated(async_client, admin_headers):
     """GET /auth/me with valid token returns user info."""
     resp = await async_client.get(f"{AUTH_PREFIX}/me", headers=admin_headers)
@@ -120,7 +111,6 @@ async def test_me_authenticated(async_client, admin_headers):
     assert len(data["permissions"]) > 0
 
 
-@pytest.mark.asyncio
 async def test_me_unauthenticated(async_client):
     """GET /auth/me without token returns 401."""
     resp = await async_client.get(f"{AUTH_PREFIX}/me")
@@ -132,7 +122,6 @@ async def test_me_unauthenticated(async_client):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
 async def test_logout_success(async_client, admin_headers):
     """POST /auth/logout with valid token returns success."""
     resp = await async_client.post(f"{AUTH_PREFIX}/logout", headers=admin_headers)
@@ -145,9 +134,10 @@ async def test_logout_success(async_client, admin_headers):
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
 async def test_account_lockout_after_failed_attempts(async_client):
     """5 failed logins lock the account (403)."""
+    # Kept serial: the login handler bumps failed_login_attempts with a
+    # read-modify-write, so concurrent attempts could lose increments.
     for _ in range(5):
         await async_client.post(
             f"{AUTH_PREFIX}/login",
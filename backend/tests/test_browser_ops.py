@@ -0,0 +1,114 @@
+"""
+Tests for parsing cookie databases dumped by manual (shell) extraction.
+"""
+
+import sqlite3
+
+from app.services.browser_ops import BrowserOpsService
+
+# 2030-01-01T00:00:00Z
+EXPIRES = 1_893_456_000
+# Same instant in Chromium's microseconds since 1601-01-01
+EXPIRES_UTC = (EXPIRES + 11_644_473_600) * 1_000_000
+
+
+def _chromium_db(path, *, wal=False):
+    conn = sqlite3.connect(path)
+    if wal:
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE cookies (host_key TEXT, name TEXT, value TEXT, "
+        "encrypted_value BLOB, path TEXT, expires_utc INTEGER, "
+        "is_secure INTEGER, is_httponly INTEGER)"
+    )
+    conn.executemany(
+        "INSERT INTO cookies VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (".example.com", "sid", "plain", b"", "/", EXPIRES_UTC, 1, 1),
+            (".example.com", "enc", "", b"v10\x01\x02", "/app", 0, 0, 0),
+            (".other.org", "tracker", "x", b"", "/", EXPIRES_UTC, 0, 0),
+        ],
+    )
+    conn.commit()
+    if wal:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+    return path.read_bytes()
+
+
+def _firefox_db(path, *, wal=False):
+    conn = sqlite3.connect(path)
+    if wal:
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE moz_cookies (host TEXT, name TEXT, value TEXT, path TEXT, "
+        "expiry INTEGER, isSecure INTEGER, isHttpOnly INTEGER)"
+    )
+    conn.executemany(
+        "INSERT INTO moz_cookies VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (".example.com", "session", "abc", "/", EXPIRES, 1, 0),
+            (".other.org", "pref", "1", "/", 0, 0, 0),
+        ],
+    )
+    conn.commit()
+    if wal:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+    return path.read_bytes()
+
+
+def _parse(db_bytes, browser, domain_filter=None):
+    return BrowserOpsService(None)._parse_manual_output(
+        db_bytes.hex(), browser, domain_filter
+    )
+
+
+def test_parse_chromium_cookie_db(tmp_path):
+    """Chromium rows are decoded with epoch conversion and hex fallback."""
+    cookies = _parse(_chromium_db(tmp_path / "Cookies"), "chrome")
+    by_name = {c["name"]: c for c in cookies}
+    assert set(by_name) == {"sid", "enc", "tracker"}
+
+    sid = by_name["sid"]
+    assert sid["value"] == "plain"
+    assert sid["expires"] == str(EXPIRES)
+    assert sid["secure"] is True
+    assert sid["http_only"] is True
+
+    enc = by_name["enc"]
+    assert enc["value"] == b"v10\x01\x02".hex()
+    assert enc["path"] == "/app"
+    assert enc["expires"] is None
+
+
+def test_parse_chromium_wal_db(tmp_path):
+    """WAL-mode Chromium databases are readable from the dumped main file."""
+    db_bytes = _chromium_db(tmp_path / "Cookies", wal=True)
+    assert db_bytes[18:20] == b"\x02\x02"
+    assert len(_parse(db_bytes, "chrome")) == 3
+
+
+def test_parse_firefox_wal_db(tmp_path):
+    """Firefox's cookies.sqlite (always WAL) is parsed."""
+    db_bytes = _firefox_db(tmp_path / "cookies.sqlite", wal=True)
+    cookies = _parse(db_bytes, "firefox")
+    by_name = {c["name"]: c for c in cookies}
+    assert set(by_name) == {"session", "pref"}
+    assert by_name["session"]["expires"] == str(EXPIRES)
+    assert by_name["session"]["secure"] is True
+    assert by_name["pref"]["expires"] is None
+
+
+def test_parse_applies_domain_filter(tmp_path):
+    """Only cookies whose host contains the filter are returned."""
+    cookies = _parse(_firefox_db(tmp_path / "cookies.sqlite"), "firefox", "example")
+    assert [c["name"] for c in cookies] == ["session"]
+
+
+def test_parse_hex_with_line_breaks(tmp_path):
+    """certutil-style hex wrapped across lines is accepted."""
+    hex_dump = _chromium_db(tmp_path / "Cookies").hex()
+    wrapped = "\r\n".join(hex_dump[i : i + 32] for i in range(0, len(hex_dump), 32))
+    cookies = BrowserOpsService(None)._parse_manual_output(wrapped, "chrome")
+    assert len(cookies) == 3
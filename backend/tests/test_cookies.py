@@ -0,0 +1,64 @@
+"""
+Tests for the stored-cookie to CDP/Playwright cookie converter.
+"""
+
+from app.services.cookies import to_browser_cookie
+
+# 2030-01-01T00:00:00Z
+EXPIRES = 1_893_456_000
+
+
+def test_epoch_expires_int_and_str():
+    """Epoch expiry is accepted as an int or a numeric string."""
+    assert to_browser_cookie({"expires": EXPIRES})["expires"] == EXPIRES
+    assert to_browser_cookie({"expires": str(EXPIRES)})["expires"] == EXPIRES
+
+
+def test_iso_expires_with_trailing_z():
+    """ISO 8601 expiry with a trailing Z is converted to epoch seconds."""
+    cookie = to_browser_cookie({"expires": "2030-01-01T00:00:00Z"})
+    assert cookie["expires"] == EXPIRES
+
+
+def test_unparseable_expires_is_dropped():
+    """Expiry that is neither epoch nor ISO 8601 leaves a session cookie."""
+    assert "expires" not in to_browser_cookie({"expires": "next tuesday"})
+    assert "expires" not in to_browser_cookie({"expires": None})
+
+
+def test_same_site_mapping():
+    """Stored sameSite values map case-insensitively; unknown ones are omitted."""
+    assert to_browser_cookie({"same_site": "lax"})["sameSite"] == "Lax"
+    assert to_browser_cookie({"same_site": "STRICT"})["sameSite"] == "Strict"
+    assert to_browser_cookie({"same_site": "None"})["sameSite"] == "None"
+    assert "sameSite" not in to_browser_cookie({"same_site": "unspecified"})
+    assert "sameSite" not in to_browser_cookie({})
+
+
+def test_url_strips_one_leading_dot():
+    """The cookie URL drops the leading dot of a domain cookie."""
+    cookie = to_browser_cookie({"domain": ".example.com", "path": "/app"})
+    assert cookie["url"] == "http://example.com/app"
+    assert cookie["domain"] == ".example.com"
+    host_only = to_browser_cookie({"domain": "example.com"})
+    assert host_only["url"] == "http://example.com/"
+
+
+def test_url_scheme_follows_secure_flag():
+    """Secure cookies get an https URL, others http."""
+    secure = to_browser_cookie({"domain": "example.com", "secure": True})
+    assert secure["url"] == "https://example.com/"
+    assert secure["secure"] is True
+    plain = to_browser_cookie({"domain": "example.com", "secure": False})
+    assert plain["url"] == "http://example.com/"
+
+
+def test_field_mapping():
+    """Stored snake_case fields become the CDP/Playwright names."""
+    cookie = to_browser_cookie(
+        {"name": "sid", "value": "abc", "domain": "example.com", "http_only": True}
+    )
+    assert cookie["name"] == "sid"
+    assert cookie["value"] == "abc"
+    assert cookie["path"] == "/"
+    assert cookie["httpOnly"] is True
@@ -2,10 +2,7 @@
 Tests for health-check and root endpoints.
 """
 
-import pytest
 
-
-@pytest.mark.asyncio
 async def test_root_endpoint(async_client):
     """GET / returns welcome message and version."""
     resp = await async_client.get("/")
@@ -15,7 +12,6 @@ async def test_root_endpoint(async_client):
     assert "version" in data
 
 
-@pytest.mark.asyncio
 async def test_health_endpoint(async_client):
     """GET /health returns status fields."""
     resp = await async_client.get("/health")
@@ -27,7 +23,6 @@ async def test_health_endpoint(async_client):
     assert "sliver_connected" in data
 
 
-@pytest.mark.asyncio
 async def test_health_sliver_disconnected(async_client):
     """Health endpoint reports sliver_connected=False when mocked."""
     resp = await async_client.get("/health")
@@ -0,0 +1,180 @@
+"""
+Tests for PlaywrightService session lifecycle, using an in-process fake
+Playwright (no Chromium needed).
+"""
+
+from app.services import playwright_service
+from app.services.playwright_service import PlaywrightService
+
+COOKIES = [{"name": "sid", "value": "abc", "domain": ".example.com"}]
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, kwargs):
+        self.kwargs = kwargs
+        self.cookies = []
+        self.closed = False
+
+    async def add_cookies(self, cookies):
+        self.cookies.extend(cookies)
+
+    async def new_page(self):
+        return FakePage()
+
+    async def storage_state(self):
+        return {"cookies": self.cookies, "origins": []}
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.closed = False
+        self.contexts = []
+
+    def is_connected(self):
+        return not self.closed
+
+    async def new_context(self, **kwargs):
+        context = FakeContext(kwargs)
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeChromium:
+    def __init__(self):
+        self.launched = []
+
+    async def launch(self, **kwargs):
+        browser = FakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.chromium = FakeChromium()
+
+    async def stop(self):
+        pass
+
+
+def _service(**kwargs) -> PlaywrightService:
+    service = PlaywrightService(**kwargs)
+    service._playwright = FakePlaywright()
+    return service
+
+
+# ---------------------------------------------------------------------------
+# Storage state
+# ---------------------------------------------------------------------------
+
+
+async def test_storage_state_saved_on_stop_and_resumed(tmp_path):
+    """State is written 0600 on stop and the next session resumes from it."""
+    service = _service(storage_state_dir=str(tmp_path / "state"))
+
+    first = await service.start_session(COOKIES)
+    assert service._sessions[first].cookies_injected == 1
+    state_path = service._sessions[first].storage_state_path
+    assert not state_path.exists()
+
+    await service.stop_session(first)
+    assert state_path.exists()
+    assert state_path.stat().st_mode & 0o777 == 0o600
+
+    second = await service.start_session(COOKIES)
+    session = service._sessions[second]
+    assert session.cookies_injected == 0
+    assert session.context.kwargs["storage_state"] == str(state_path)
+    assert session.context.cookies == []
+
+
+async def test_context_closed_when_state_save_fails(tmp_path, monkeypatch):
+    """A failed save is logged and the context is still closed."""
+    service = _service(storage_state_dir=str(tmp_path / "state"))
+    first = await service.start_session(COOKIES)
+    other = await service.start_session([])
+    context = service._sessions[first].context
+
+    def _fail(path, data):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(playwright_service, "_write_private", _fail)
+    await service.stop_session(first)
+
+    assert context.closed
+    assert other in service.active_sessions
+
+
+# ---------------------------------------------------------------------------
+# Browser pooling
+# ---------------------------------------------------------------------------
+
+
+async def test_sequential_sessions_reuse_browser():
+    """start -> stop -> start on the same proxy launches Chromium once."""
+    service = _service()
+    launched = service._playwright.chromium.launched
+
+    await service.stop_session(await service.start_session([], proxy="socks5://a"))
+    await service.stop_session(await service.start_session([], proxy="socks5://a"))
+
+    assert len(launched) == 1
+    assert not launched[0].closed
+
+
+async def test_idle_browsers_capped_lru(monkeypatch):
+    """Idle browsers beyond the cap are closed, least recently used first."""
+    monkeypatch.setattr(playwright_service, "_MAX_IDLE_BROWSERS", 2)
+    service = _service()
+    launched = service._playwright.chromium.launched
+
+    for proxy in ("socks5://a", "socks5://b"):
+        await service.stop_session(await service.start_session([], proxy=proxy))
+    # Reusing "a" makes "b" the least recently used idle browser
+    await service.stop_session(await service.start_session([], proxy="socks5://a"))
+    await service.stop_session(await service.start_session([], proxy="socks5://c"))
+
+    browser_a, browser_b, browser_c = launched
+    assert browser_b.closed
+    assert not browser_a.closed
+    assert not browser_c.closed
+
+
+async def test_busy_browser_not_evicted(monkeypatch):
+    """A browser with a running session is never closed by the idle cap."""
+    monkeypatch.setattr(playwright_service, "_MAX_IDLE_BROWSERS", 0)
+    service = _service()
+    launched = service._playwright.chromium.launched
+
+    busy = await service.start_session([], proxy="socks5://a")
+    await service.stop_session(await service.start_session([], proxy="socks5://b"))
+
+    assert not launched[0].closed
+    assert launched[1].closed
+    assert busy in service.active_sessions
+
+
+async def test_shutdown_closes_idle_browsers():
+    """shutdown() closes running and idle browsers alike."""
+    service = _service()
+    launched = service._playwright.chromium.launched
+
+    await service.stop_session(await service.start_session([], proxy="socks5://a"))
+    await service.start_session([], proxy="socks5://b")
+    await service.shutdown()
+
+    assert all(browser.closed for browser in launched)
@@ -3,21 +3,35 @@ Tests for user-management endpoints (/api/v1/users/*).
 All endpoints require admin role.
 """
 
+import uuid
+
 import pytest
+from sqlalchemy.exc import IntegrityError
 
 from app.core.config import settings
+from app.models import User
 
 USERS_PREFIX = "/api/v1/users"
 
 
+def _user_url(user_id: int) -> str:
+    """URL of a single user resource."""
+    return f"{USERS_PREFIX}/{user_id}"
+
+
+def _uid() -> str:
+    """Short random suffix that keeps usernames unique across tests."""
+    return uuid.uuid4().hex[:8]
+
+
 # ---------------------------------------------------------------------------
-# List users
+# CRUD happy path
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_list_users_as_admin(async_client, admin_headers):
-    """Admin can list users; at least the seeded admin is present."""
+async def test_user_crud_flow(async_client, admin_headers, test_db):
+    """Admin can list, create, fetch, update and delete a user."""
+    # List: at least the seeded admin is present
     resp = await async_client.get(USERS_PREFIX, headers=admin_headers)
     assert resp.status_code == 200
     data = resp.json()
@@ -25,146 +39,89 @@ async def test_list_users_as_admin(async_client, admin_headers):
     usernames = [u["username"] for u in data["users"]]
     assert settings.admin_username in usernames
 
-
-@pytest.mark.asyncio
-async def test_list_users_unauthenticated(async_client):
-    """Unauthenticated request to list users returns 401."""
-    resp = await async_client.get(USERS_PREFIX)
-    assert resp.status_code == 401
-
-
-# ---------------------------------------------------------------------------
-# Create user
-# ---------------------------------------------------------------------------
-
-
-@pytest.mark.asyncio
-async def test_create_user(async_client, admin_headers):
-    """Admin can create a new user."""
+    # Create
+    username = f"testoper_{_uid()}"
     resp = await async_client.post(
         USERS_PREFIX,
         headers=admin_headers,
         json={
-            "username": "testoper",
+            "username": username,
             "password": "securepassword1",
-            "email": "testoper@test.local",
+            "email": f"{username}@test.local",
             "role_id": 2,
         },
     )
     assert resp.status_code == 201
     data = resp.json()
-    assert data["username"] == "testoper"
+    assert data["username"] == username
     assert data["is_active"] is True
+    user_id = data["id"]
 
+    # Get by ID
+    resp = await async_client.get(_user_url(user_id), headers=admin_headers)
+    assert resp.status_code == 200
+    assert resp.json()["username"] == username
 
-@pytest.mark.asyncio
-async def test_create_duplicate_username(async_client, admin_headers):
-    """Creating a user with an existing username returns 400."""
-    payload = {
-        "username": "dupuser",
-        "password": "securepassword1",
-        "role_id": 2,
-    }
-    resp1 = await async_client.post(USERS_PREFIX, headers=admin_headers, json=payload)
-    assert resp1.status_code == 201
-
-    resp2 = await async_client.post(USERS_PREFIX, headers=admin_headers, json=payload)
-    assert resp2.status_code == 400
-    assert "already exists" in resp2.json()["detail"].lower()
-
-
-# ---------------------------------------------------------------------------
-# Get user by ID
-# ---------------------------------------------------------------------------
-
-
-@pytest.mark.asyncio
-async def test_get_user_by_id(async_client, admin_headers):
-    """Admin can fetch a user by ID."""
-    # Create a user first
-    create_resp = await async_client.post(
-        USERS_PREFIX,
+    # Update email
+    resp = await async_client.put(
+        _user_url(user_id),
         headers=admin_headers,
-        json={
-            "username": "fetchme",
-            "password": "securepassword1",
-            "role_id": 2,
-        },
+        json={"email": f"new_{username}@test.local"},
     )
-    user_id = create_resp.json()["id"]
+    assert resp.status_code == 200
+    assert resp.json()["email"] == f"new_{username}@test.local"
 
-    resp = await async_client.get(f"{USERS_PREFIX}/{user_id}", headers=admin_headers)
+    # Delete
+    resp = await async_client.delete(_user_url(user_id), headers=admin_headers)
     assert resp.status_code == 200
-    assert resp.json()["username"] == "fetchme"
+    assert "deleted" in resp.json()["message"].lower()
+
+    # Verify gone
+    assert await test_db.get(User, user_id) is None
 
 
 # ---------------------------------------------------------------------------
-# Update user
+# Negative paths
 # ---------------------------------------------------------------------------
 
 
-@pytest.mark.asyncio
-async def test_update_user(async_client, admin_headers):
-    """Admin can update a user's email."""
-    create_resp = await async_client.post(
-        USERS_PREFIX,
-        headers=admin_headers,
-        json={
-            "username": "updateme",
-            "password": "securepassword1",
-            "role_id": 2,
-        },
-    )
-    user_id = create_resp.json()["id"]
-
-    resp = await async_client.put(
-        f"{USERS_PREFIX}/{user_id}",
-        headers=admin_headers,
-        json={"email": "new@test.local"},
-    )
-    assert resp.status_code == 200
-    assert resp.json()["email"] == "new@test.local"
-
+async def test_list_users_unauthenticated(async_client):
+    """Unauthenticated request to list users returns 401."""
+    resp = await async_client.get(USERS_PREFIX)
+    assert resp.status_code == 401
 
-# ---------------------------------------------------------------------------
-# Delete user
-# ---------------------------------------------------------------------------
 
+async def test_create_duplicate_username(async_client, admin_headers, user_factory):
+    """Creating a user with an existing username returns 400."""
+    await user_factory(username="dupuser")
 
-@pytest.mark.asyncio
-async def test_delete_user(async_client, admin_headers):
-    """Admin can delete another user."""
-    create_resp = await async_client.post(
+    resp = await async_client.post(
         USERS_PREFIX,
         headers=admin_headers,
         json={
-            "username": "deleteme",
+            "username": "dupuser",
             "password": "securepassword1",
             "role_id": 2,
         },
     )
-    user_id = create_resp.json()["id"]
+    assert resp.status_code == 400
+    assert "already exists" in resp.json()["detail"].lower()
 
-    resp = await async_client.delete(f"{USERS_PREFIX}/{user_id}", headers=admin_headers)
-    assert resp.status_code == 200
-    assert "deleted" in resp.json()["message"].lower()
 
-    # Verify gone
-    get_resp = await async_client.get(
-        f"{USERS_PREFIX}/{user_id}", headers=admin_headers
-    )
-    assert get_resp.status_code == 404
+async def test_duplicate_username_rejected_by_database(test_db, user_factory):
+    """The users table itself refuses a second row with the same username."""
+    await user_factory(username="dupuser")
+
+    with pytest.raises(IntegrityError):
+        await user_factory(username="dupuser")
+    await test_db.rollback()
 
 
-@pytest.mark.asyncio
-async def test_admin_cannot_delete_self(async_client, admin_headers):
+async def test_admin_cannot_delete_self(async_client, admin_auth):
     """Admin cannot delete their own account."""
-    # Get admin user ID via /auth/me
-    me_resp = await async_client.get("/api/v1/auth/me", headers=admin_headers)
-    admin_id = me_resp.json()["id"]
+    admin_id = admin_auth["id"]
+    headers = admin_auth["headers"]
 
-    resp = await async_client.delete(
-        f"{USERS_PREFIX}/{admin_id}", headers=admin_headers
-    )
+    resp = await async_client.delete(_user_url(admin_id), headers=headers)
     assert resp.status_code == 400
     assert "cannot delete" in resp.json()["detail"].lower()